@@ -0,0 +1,25 @@
+# healthcheck.py
+# Standalone health-check service for JupyterHub
+#
+# Kept as a real file (instead of an inline `python3 -c` string in
+# jupyterhub_config.py) so the interpreter can reuse the cached .pyc
+# across hub restarts.
+
+import tornado.web
+import tornado.ioloop
+from tornado.httpserver import HTTPServer
+
+
+class HealthHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.write({"status": "ok", "timestamp": "2025-01-09"})
+
+
+app = tornado.web.Application([
+    (r"/health", HealthHandler),
+])
+
+if __name__ == "__main__":
+    server = HTTPServer(app)
+    server.listen(8082)
+    tornado.ioloop.IOLoop.current().start()
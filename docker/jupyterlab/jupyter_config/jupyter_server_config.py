@@ -14,11 +14,10 @@ c.ServerApp.password = ''
 
 # File management
 c.ServerApp.allow_origin = '*'
-c.ServerApp.tornado_settings = {
-    'headers': {
-        'Content-Security-Policy': "frame-ancestors 'self' *;"
-    }
-}
+
+# tornado_settings (frame-ancestors CSP) is assigned once in
+# jupyter_lab_config.py; a second assignment here would just make
+# traitlets validate and copy the dict twice at startup.
 
 # Logging
 c.Application.log_level = 'INFO'
\ No newline at end of file
